@@ -1,28 +1,35 @@
+import hashlib
+import hmac
+
 import streamlit as st
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 
 st.set_page_config(page_title="CRMC Infusion ROI Simulator", layout="wide")
 
 # ---------------- Password Protection ----------------
-PASSWORD = "CRMC2024"
+PASSWORD_HASH = hashlib.sha256(b"CRMC2024").digest()
 if "authenticated" not in st.session_state:
     st.session_state["authenticated"] = False
 
 if not st.session_state["authenticated"]:
     st.title("🔒 CRMC Infusion ROI Simulator")
     password = st.text_input("Enter password to continue:", type="password")
-    if password == PASSWORD:
+    if hmac.compare_digest(hashlib.sha256(password.encode()).digest(), PASSWORD_HASH):
         st.session_state["authenticated"] = True
         st.rerun()
     else:
         st.stop()
 
+# Imported only once the password check has passed, so the login view does
+# not pay for loading the numeric and charting stacks.
+import pandas as pd
+import altair as alt
+
+import roi_core
+
 # ---------------- Inputs ----------------
 st.title("💉 Infusion Chair ROI Model")
 
-with st.sidebar:
+with st.sidebar.form("model_inputs"):
     st.header("Model Inputs")
 
     st.subheader("💺 Capacity & Construction")
@@ -50,86 +57,105 @@ with st.sidebar:
     days_per_year = st.number_input("Operational Days per Year", value=260)
 
     st.subheader("📊 Financial Settings")
-    forecast_years = st.number_input("Forecast Period (Years)", value=10)
+    forecast_years = st.number_input("Forecast Period (Years)", min_value=1, max_value=100, value=10)
     discount_rate = st.number_input("Discount Rate (%)", value=3.0) / 100
 
+    st.form_submit_button("Run model")
+
 # ---------------- Calculations ----------------
-facility_sqft = num_chairs * sqft_per_chair
-construction_cost = facility_sqft * cost_per_sqft
-equipment_cost = num_chairs * equipment_cost_per_chair
-capital_cost_total = construction_cost + equipment_cost
-
-rn_fte_required = np.ceil((num_chairs / chairs_per_rn) * shifts_per_day)
-rn_cost_total = rn_fte_required * rn_cost
-
-max_visits = num_chairs * visits_per_chair_per_day * days_per_year
-
-# Visits per year based on ramping utilization
-visits_per_year = []
-utilization_by_year = []
-
-for year in range(forecast_years):
-    utilization = min(initial_utilization * ((1 + annual_growth) ** year), max_utilization)
-    adjusted_visits = max_visits * utilization
-    visits_per_year.append(adjusted_visits)
-    utilization_by_year.append(utilization)
-
-# Financials
-revenue = [v * reimbursement for v in visits_per_year]
-supply_costs = [v * supply_cost_per_visit for v in visits_per_year]
-operating_costs = [rn_cost_total + overhead_cost + sc for sc in supply_costs]
-net_income = [rev - cost for rev, cost in zip(revenue, operating_costs)]
-
-# Discounted Cash Flow
-cumulative_cashflow = []
-discounted_cashflow = []
-cumulative_npv = []
-total_npv = 0
-
-for year in range(forecast_years):
-    cash = net_income[year] if year > 0 else net_income[year] - capital_cost_total
-    discounted = cash / ((1 + discount_rate) ** year)
-    total_npv += discounted
-    discounted_cashflow.append(discounted)
-    cumulative_cashflow.append(sum(net_income[:year + 1]) - capital_cost_total)
-    cumulative_npv.append(total_npv)
+@st.cache_data(show_spinner=False, max_entries=32)
+def compute_model(**params):
+    return roi_core.compute(**params)
+
+
+# ---------------- Charts ----------------
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_npv_chart(years, cum_npv):
+    chart_df = pd.DataFrame({"Year": years, "Cumulative NPV": cum_npv})
+    npv_line = alt.Chart(chart_df).mark_line(point=True).encode(
+        x=alt.X("Year:O", axis=alt.Axis(labelAngle=0)),
+        y=alt.Y("Cumulative NPV:Q", title="Cumulative Net Gain ($)", axis=alt.Axis(format="$,.0f")),
+        tooltip=["Year", alt.Tooltip("Cumulative NPV:Q", format="$,.0f")],
+    )
+    breakeven = alt.Chart(pd.DataFrame({"y": [0]})).mark_rule(color="red", strokeDash=[4, 4]).encode(y="y:Q")
+    return (npv_line + breakeven).properties(title="Net Present Value Over Time")
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_visits_chart(years, visits, max_visits, max_utilization):
+    cap = max_visits * max_utilization
+    series = ["Adjusted Visits (Utilization Ramp)", "100% Max Capacity", f"{int(max_utilization*100)}% Cap"]
+    color = alt.Color("Series:N", title=None,
+                      scale=alt.Scale(domain=series, range=["steelblue", "gray", "orange"]))
+    visits_line = alt.Chart(pd.DataFrame({"Year": years, "Visits": visits, "Series": series[0]})).mark_line(point=True).encode(
+        x=alt.X("Year:O", axis=alt.Axis(labelAngle=0)),
+        y=alt.Y("Visits:Q", title="Annual Infusion Visits", axis=alt.Axis(format=",.0f")),
+        color=color,
+        tooltip=["Year", alt.Tooltip("Visits:Q", format=",.0f")],
+    )
+    # Capacity levels are constant, so draw them as horizontal rules instead of per-year series
+    capacity = alt.Chart(pd.DataFrame({"Visits": [max_visits, cap], "Series": series[1:]})).mark_rule(strokeDash=[4, 4]).encode(
+        y="Visits:Q",
+        color=color,
+        tooltip=["Series", alt.Tooltip("Visits:Q", format=",.0f")],
+    )
+    return (visits_line + capacity).properties(title="Projected Visit Volume Over Time")
+
+
+params = dict(
+    num_chairs=num_chairs,
+    sqft_per_chair=sqft_per_chair,
+    cost_per_sqft=cost_per_sqft,
+    equipment_cost_per_chair=equipment_cost_per_chair,
+    initial_utilization=initial_utilization,
+    max_utilization=max_utilization,
+    annual_growth=annual_growth,
+    rn_cost=rn_cost,
+    chairs_per_rn=chairs_per_rn,
+    shifts_per_day=shifts_per_day,
+    supply_cost_per_visit=supply_cost_per_visit,
+    overhead_cost=overhead_cost,
+    reimbursement=reimbursement,
+    visits_per_chair_per_day=visits_per_chair_per_day,
+    days_per_year=days_per_year,
+    forecast_years=forecast_years,
+    discount_rate=discount_rate,
+)
+
+# Most reruns (including every non-submit rerun of the form) see the same
+# inputs, so only recompute when they actually change. The inputs themselves
+# are the key (not their hash, which can collide, e.g. hash(-1) == hash(-2)).
+# session_state keeps only this session's latest result set. It does not limit
+# the shared caches behind compute_model and the chart builders, which have
+# their own max_entries caps.
+inputs_key = tuple(params.items())
+if st.session_state.get("inputs_key") != inputs_key:
+    st.session_state["results"] = compute_model(**params)
+    st.session_state["inputs_key"] = inputs_key
+results = st.session_state["results"]
+years = results["years"]
+max_visits = results["max_visits"]
+visits_per_year = results["visits"]
+cumulative_npv = results["cum_npv"]
+summary_df = results["summary_df"]
 
 # ---------------- Output ----------------
 st.subheader("📊 ROI Summary")
-summary_df = pd.DataFrame({
-    "Year": list(range(1, forecast_years + 1)),
-    "Utilization (%)": [f"{u*100:.1f}%" for u in utilization_by_year],
-    "Visits": np.round(visits_per_year),
-    "Revenue ($)": np.round(revenue),
-    "Op Costs ($)": np.round(operating_costs),
-    "Net Income ($)": np.round(net_income),
-    "Cum Cashflow ($)": np.round(cumulative_cashflow),
-    "NPV ($)": np.round(discounted_cashflow),
-    "Cum NPV ($)": np.round(cumulative_npv)
-})
 
-st.dataframe(summary_df.style.format({
-    "Visits": "{:,.0f}",
-    "Revenue ($)": "{:,.0f}",
-    "Op Costs ($)": "{:,.0f}",
-    "Net Income ($)": "{:,.0f}",
-    "Cum Cashflow ($)": "{:,.0f}",
-    "NPV ($)": "{:,.0f}",
-    "Cum NPV ($)": "{:,.0f}"
-}), use_container_width=True)
+st.dataframe(summary_df, use_container_width=True, column_config={
+    "Utilization (%)": st.column_config.NumberColumn(format="%.1f%%"),
+    "Visits": st.column_config.NumberColumn(format="%,.0f"),
+    "Revenue ($)": st.column_config.NumberColumn(format="%,.0f"),
+    "Op Costs ($)": st.column_config.NumberColumn(format="%,.0f"),
+    "Net Income ($)": st.column_config.NumberColumn(format="%,.0f"),
+    "Cum Cashflow ($)": st.column_config.NumberColumn(format="%,.0f"),
+    "NPV ($)": st.column_config.NumberColumn(format="%,.0f"),
+    "Cum NPV ($)": st.column_config.NumberColumn(format="%,.0f")
+})
 
 # ROI Chart
 st.subheader("💡 Breakeven Visualization")
-fig, ax = plt.subplots()
-ax.plot(summary_df["Year"], summary_df["Cum NPV ($)"], marker="o", label="Cumulative NPV")
-ax.axhline(0, color='red', linestyle='--', linewidth=1)
-ax.set_xlabel("Year")
-ax.set_ylabel("Cumulative Net Gain ($)")
-ax.set_title("Net Present Value Over Time")
-ax.ticklabel_format(style='plain', axis='y')
-ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"${x:,.0f}"))
-ax.legend()
-st.pyplot(fig)
+st.altair_chart(build_npv_chart(years, cumulative_npv), use_container_width=True)
 
 # Interpretation
 final_npv = cumulative_npv[-1]
@@ -140,17 +166,7 @@ else:
 
 # Growth Forecast Chart (Always Visible)
 st.subheader("📈 Projected Annual Infusion Visits")
-fig2, ax2 = plt.subplots()
-years = list(range(1, forecast_years + 1))
-ax2.plot(years, visits_per_year, marker="o", label="Adjusted Visits (Utilization Ramp)")
-ax2.plot(years, [max_visits] * forecast_years, linestyle="--", color="gray", label="100% Max Capacity")
-ax2.plot(years, [max_visits * max_utilization] * forecast_years, linestyle="--", color="orange", label=f"{int(max_utilization*100)}% Cap")
-ax2.set_xlabel("Year")
-ax2.set_ylabel("Annual Infusion Visits")
-ax2.set_title("Projected Visit Volume Over Time")
-ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:,.0f}"))
-ax2.legend()
-st.pyplot(fig2)
+st.altair_chart(build_visits_chart(years, visits_per_year, max_visits, max_utilization), use_container_width=True)
 
 # Tabs: FAQ & Calculations
 tab1, tab2 = st.tabs(["📘 FAQ & Definitions", "🧮 Calculations & Formulas"])
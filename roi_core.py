@@ -0,0 +1,73 @@
+from math import ceil
+
+import numpy as np
+import pandas as pd
+
+
+# Plain NumPy core with no Streamlit calls, so it can also drive parameter sweeps.
+def project(num_chairs, sqft_per_chair, cost_per_sqft, equipment_cost_per_chair,
+            initial_utilization, max_utilization, annual_growth,
+            rn_cost, chairs_per_rn, shifts_per_day, supply_cost_per_visit, overhead_cost,
+            reimbursement, visits_per_chair_per_day, days_per_year,
+            forecast_years, discount_rate):
+    facility_sqft = num_chairs * sqft_per_chair
+    construction_cost = facility_sqft * cost_per_sqft
+    equipment_cost = num_chairs * equipment_cost_per_chair
+    capital_cost_total = construction_cost + equipment_cost
+
+    rn_fte_required = ceil((num_chairs / chairs_per_rn) * shifts_per_day)
+    rn_cost_total = rn_fte_required * rn_cost
+
+    max_visits = num_chairs * visits_per_chair_per_day * days_per_year
+
+    years = np.arange(forecast_years)
+    disc_factors = np.power(1.0 + discount_rate, years)
+    growth_factors = np.power(1.0 + annual_growth, years)
+
+    # Visits per year based on ramping utilization
+    utilization_by_year = np.minimum(initial_utilization * growth_factors, max_utilization)
+    visits_per_year = max_visits * utilization_by_year
+
+    # Financials
+    fixed_costs = rn_cost_total + overhead_cost
+    revenue = visits_per_year * reimbursement
+    supply_costs = visits_per_year * supply_cost_per_visit
+    operating_costs = supply_costs + fixed_costs
+    net_income = revenue - operating_costs
+
+    # Discounted Cash Flow
+    cash = net_income.copy()
+    cash[0] -= capital_cost_total
+    discounted_cashflow = cash / disc_factors
+    cumulative_npv = np.cumsum(discounted_cashflow)
+    cumulative_cashflow = np.cumsum(net_income) - capital_cost_total
+
+    return (max_visits, utilization_by_year, visits_per_year, revenue, operating_costs,
+            net_income, cumulative_cashflow, discounted_cashflow, cumulative_npv)
+
+
+def compute(**params):
+    (max_visits, utilization_by_year, visits_per_year, revenue, operating_costs,
+     net_income, cumulative_cashflow, discounted_cashflow, cumulative_npv) = project(**params)
+
+    years_col = np.arange(1, len(visits_per_year) + 1, dtype=np.int16)
+    summary_df = pd.DataFrame({
+        "Year": years_col,
+        "Utilization (%)": utilization_by_year * 100,
+        "Visits": visits_per_year,
+        "Revenue ($)": revenue,
+        "Op Costs ($)": operating_costs,
+        "Net Income ($)": net_income,
+        "Cum Cashflow ($)": cumulative_cashflow,
+        "NPV ($)": discounted_cashflow,
+        "Cum NPV ($)": cumulative_npv
+    })
+
+    return {
+        "years": years_col,
+        "max_visits": max_visits,
+        "visits": visits_per_year,
+        "cum_npv": cumulative_npv,
+        "summary_df": summary_df,
+    }
+